@@ -1,5 +1,6 @@
 """Daikin DIII-Net Modbus data structures."""
 
+from array import array
 import logging
 import time
 
@@ -33,7 +34,8 @@ class InputBase:
                 % (len(registers), self.COUNT)
             )
 
-        self._registers = registers
+        # Fixed-width 16-bit storage, same layout as the Modbus registers
+        self._registers = array("H", registers)
         self._dirty = False
         self._timeRead = time.perf_counter()
 
@@ -56,8 +58,8 @@ class InputBase:
         return value
 
     def _decode_bit_array(self, start, length):
-        """Decode a word into an array of bits."""
-        return [self._bit(x) for x in range(start, start + length)]
+        """Decode a run of bits lazily, one bool per position."""
+        return (self._bit(x) for x in range(start, start + length))
 
     def _decode_bit(self, start) -> bool:
         """Decode a bit from the registers."""
@@ -65,18 +67,22 @@ class InputBase:
 
     def _decode_uint(self, start, length) -> int:
         """Decode an unsigned int from the registers."""
-        result: int = 0
-        for bit in range(length):
-            if self._bit(start + bit):
-                result += 1 << bit
-        return result
+        register = start >> 4
+        shift = start & 15
+        mask = (1 << length) - 1
+        if shift + length <= 16:
+            return (self._registers[register] >> shift) & mask
+
+        # Field spans registers, combine them little-endian before masking.
+        value = 0
+        for word in reversed(self._registers[register : (start + length + 15) >> 4]):
+            value = (value << 16) | word
+        return (value >> shift) & mask
 
     def _decode_sint(self, start, length) -> int:
-        """Decode a signed int from the registers."""
-        result = self._decode_uint(start, length - 1)
-        if self._bit(start + length):
-            result = 0 - result
-        return result
+        """Decode a two's complement signed int from the registers."""
+        sign_bit = 1 << (length - 1)
+        return (self._decode_uint(start, length) ^ sign_bit) - sign_bit
 
     def _encode_bit(self, start: int, value: bool):
         """Encode a bit into a position in a register."""
@@ -84,13 +90,23 @@ class InputBase:
 
     def _encode_uint(self, start: int, length: int, value: int):
         """Encode an unsigned int into a position in a register."""
-        for bit in range(length):
-            self._bit(start + bit, (value & 1 << bit) > 0)
+        register = start >> 4
+        shift = start & 15
+        if shift + length > 16:
+            for bit in range(length):
+                self._bit(start + bit, (value & 1 << bit) > 0)
+            return
+
+        mask = ((1 << length) - 1) << shift
+        current = self._registers[register]
+        updated = (current & ~mask) | ((value << shift) & mask)
+        if updated != current:
+            self._registers[register] = updated
+            self._dirty = True
 
     def _encode_sint(self, start: int, length: int, value: int):
-        """Encode a signed int into a position in a register."""
-        self._encode_uint(start, length - 1, abs(value))
-        self._encode_bit(start + length - 1, value < 0)
+        """Encode a two's complement signed int into a position in a register."""
+        self._encode_uint(start, length, value & ((1 << length) - 1))
 
     def readWithin(self, seconds: float):
         """Whether the registers have been loaded from modbus withing X seconds."""
@@ -122,7 +138,7 @@ class HoldingBase(InputBase):
     @property
     def registers(self) -> list[int]:
         """Internal register array."""
-        return self._registers
+        return list(self._registers)
 
     def sync(self, source, properties: list[str]):
         """Copy properties in from another object."""
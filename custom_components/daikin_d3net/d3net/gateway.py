@@ -92,8 +92,10 @@ class D3netGateway:
                     system_decoder.other_device_exists,
                 )
 
-                for index, connected in enumerate(system_decoder.units_connected):
-                    if connected and not system_decoder.units_error[index]:
+                for index, (connected, error) in enumerate(
+                    zip(system_decoder.units_connected, system_decoder.units_error)
+                ):
+                    if connected and not error:
                         capabilities: UnitCapability = await self._async_read(
                             UnitCapability, index
                         )
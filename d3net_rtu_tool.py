@@ -4,15 +4,18 @@
 from __future__ import annotations
 
 import argparse
-import glob
 import json
+import os
 import sys
+import threading
 import time
 import traceback
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from functools import lru_cache
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Iterable
+from typing import Any, Callable, Iterable
 
 REPO_ROOT = Path(__file__).resolve().parent
 D3NET_PYTHON_LIB = REPO_ROOT / "custom_components" / "daikin_d3net"
@@ -23,6 +26,24 @@ if str(D3NET_PYTHON_LIB) not in sys.path:
 from d3net.const import D3netFanDirection, D3netFanSpeed, D3netOperationMode
 from d3net.encoding import SystemStatus, UnitCapability, UnitError, UnitHolding, UnitStatus
 
+# Modbus limits a single read to 125 registers
+MAX_READ_REGISTERS = 125
+# Idle units tolerated inside one bulk read before splitting into separate requests
+BULK_READ_MAX_GAP = 4
+
+# Capabilities are fixed after power-up; re-read them once a day at most
+CAP_CACHE_MAX_AGE = 24 * 3600
+
+_CAP_CACHE_LOCK = threading.Lock()
+
+_MODE_CAPABILITY = {
+    D3netOperationMode.FAN: "fan_mode_capable",
+    D3netOperationMode.HEAT: "heat_mode_capable",
+    D3netOperationMode.COOL: "cool_mode_capable",
+    D3netOperationMode.AUTO: "auto_mode_capable",
+    D3netOperationMode.DRY: "dry_mode_capable",
+}
+
 
 @dataclass(frozen=True)
 class RtuConfig:
@@ -33,12 +54,13 @@ class RtuConfig:
     stopbits: int
     timeout: float
     slave: int
+    poll_interval_ms: float | None = None
 
 
 def _build_client(cfg: RtuConfig):
     from pymodbus.client import ModbusSerialClient
 
-    return ModbusSerialClient(
+    client = ModbusSerialClient(
         port=cfg.port,
         baudrate=cfg.baudrate,
         bytesize=cfg.bytesize,
@@ -46,6 +68,17 @@ def _build_client(cfg: RtuConfig):
         stopbits=cfg.stopbits,
         timeout=cfg.timeout,
     )
+    # pymodbus polls in_waiting every `_recv_interval` (~4 character times) while a
+    # response arrives. Private API, so only override it on request and where it exists.
+    if cfg.poll_interval_ms is not None:
+        if hasattr(client, "_recv_interval"):
+            client._recv_interval = max(0.001, cfg.poll_interval_ms / 1000)
+        else:
+            print(
+                "WARNING: --poll-interval-ms ignored; this pymodbus version has no _recv_interval",
+                file=sys.stderr,
+            )
+    return client
 
 
 def _read_input(client: Any, address: int, count: int, slave: int) -> list[int]:
@@ -56,6 +89,35 @@ def _read_input(client: Any, address: int, count: int, slave: int) -> list[int]:
     return response.registers
 
 
+def _read_input_bulk(
+    client: Any, base: int, per_unit_count: int, units: Iterable[int], slave: int
+) -> dict[int, list[int]]:
+    """Read per-unit register blocks for `units` in as few requests as possible."""
+    max_span = max(1, MAX_READ_REGISTERS // per_unit_count)
+    ordered = sorted(set(units))
+    blocks: dict[int, list[int]] = {}
+
+    start = 0
+    while start < len(ordered):
+        first = ordered[start]
+        end = start + 1
+        while (
+            end < len(ordered)
+            and ordered[end] - ordered[end - 1] - 1 <= BULK_READ_MAX_GAP
+            and ordered[end] - first < max_span
+        ):
+            end += 1
+
+        span = ordered[end - 1] - first + 1
+        registers = _read_input(client, base + first * per_unit_count, span * per_unit_count, slave)
+        for index in ordered[start:end]:
+            offset = (index - first) * per_unit_count
+            blocks[index] = registers[offset : offset + per_unit_count]
+        start = end
+
+    return blocks
+
+
 def _read_holding(client: Any, address: int, count: int, slave: int) -> list[int]:
     response = client.read_holding_registers(address=address, count=count, device_id=slave)
     if response.isError():
@@ -69,6 +131,26 @@ def _write_holding(client: Any, address: int, values: list[int], slave: int) ->
         raise RuntimeError(f"write_registers failed at {address} ({response})")
 
 
+def _write_holding_register(client: Any, address: int, value: int, slave: int) -> None:
+    response = client.write_register(address=address, value=value, device_id=slave)
+    if response.isError():
+        raise RuntimeError(f"write_register failed at {address} ({response})")
+
+
+def _write_holding_changes(
+    client: Any, address: int, before: list[int], after: list[int], slave: int
+) -> None:
+    """Write only the span of registers that differs between `before` and `after`."""
+    changed = [offset for offset, (old, new) in enumerate(zip(before, after)) if old != new]
+    if not changed:
+        return
+    first, last = changed[0], changed[-1]
+    if first == last:
+        _write_holding_register(client, address + first, after[first], slave)
+    else:
+        _write_holding(client, address + first, after[first : last + 1], slave)
+
+
 def _unit_id(index: int) -> str:
     return f"{int(index / 16 + 1)}-{index % 16:02d}"
 
@@ -84,13 +166,57 @@ def _enum_names(enum_cls: type) -> list[str]:
     return [member.name.lower() for member in enum_cls]
 
 
+@lru_cache(maxsize=None)
+def _enum_map(enum_cls: type) -> dict[str, Any]:
+    return {member.name.lower().replace("_", ""): member for member in enum_cls}
+
+
 def _parse_enum(enum_cls: type, text: str):
-    normalized = text.strip().lower().replace("-", "")
-    for member in enum_cls:
-        if member.name.lower().replace("_", "") == normalized:
-            return member
-    choices = ", ".join(_enum_names(enum_cls))
-    raise argparse.ArgumentTypeError(f"Unknown value '{text}'. Valid values: {choices}")
+    try:
+        return _enum_map(enum_cls)[text.strip().lower().replace("-", "")]
+    except KeyError:
+        choices = ", ".join(_enum_names(enum_cls))
+        raise argparse.ArgumentTypeError(f"Unknown value '{text}'. Valid values: {choices}") from None
+
+
+def _cap_cache_path() -> Path:
+    return Path.home() / ".cache" / "daikin_d3net" / "capabilities.json"
+
+
+def _load_cap_cache() -> dict[str, Any]:
+    try:
+        cache = json.loads(_cap_cache_path().read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+def _save_cap_cache(cache: dict[str, Any]) -> None:
+    path = _cap_cache_path()
+    # Merge with what is on disk so concurrent per-port scans keep each other's entries
+    with _CAP_CACHE_LOCK:
+        merged = _load_cap_cache()
+        merged.update(cache)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(merged), encoding="utf-8")
+        except OSError:
+            # Cache is best effort; a read-only home must not break the command
+            pass
+
+
+def _cap_cache_key(cfg: RtuConfig, index: int) -> str:
+    return f"{cfg.port}|{cfg.slave}|{index}"
+
+
+def _cached_capability(cache: dict[str, Any], cfg: RtuConfig, index: int) -> UnitCapability | None:
+    entry = cache.get(_cap_cache_key(cfg, index))
+    try:
+        if time.time() - entry["read_at"] > CAP_CACHE_MAX_AGE:
+            return None
+        return UnitCapability(entry["registers"])
+    except (TypeError, KeyError, ValueError, OverflowError):
+        return None
 
 
 def _list_candidate_ports() -> list[str]:
@@ -104,10 +230,25 @@ def _list_candidate_ports() -> list[str]:
     except Exception:
         candidates = []
 
-    # Fallback globbing for POSIX if list_ports missing/empty
+    # Fallback for POSIX if list_ports missing/empty: one pass over /dev, then by-id links
     if not candidates:
-        for pattern in ("/dev/ttyUSB*", "/dev/ttyACM*", "/dev/serial/by-id/*"):
-            candidates.extend(sorted(glob.glob(pattern)))
+        usb: list[str] = []
+        acm: list[str] = []
+        try:
+            with os.scandir("/dev") as entries:
+                for entry in entries:
+                    if entry.name.startswith("ttyUSB"):
+                        usb.append(entry.path)
+                    elif entry.name.startswith("ttyACM"):
+                        acm.append(entry.path)
+        except OSError:
+            pass
+        candidates = sorted(usb) + sorted(acm)
+        try:
+            with os.scandir("/dev/serial/by-id") as entries:
+                candidates.extend(sorted(entry.path for entry in entries))
+        except OSError:
+            pass
 
     return candidates
 
@@ -123,78 +264,123 @@ def _list_ports() -> None:
         print(f"- {port}")
 
 
-def _scan_units(client: Any, cfg: RtuConfig, verbose: bool) -> list[int]:
+def _scan_units(
+    client: Any, cfg: RtuConfig, verbose: bool, emit: Callable[[str], None] = print
+) -> list[int]:
     system = SystemStatus(_read_input(client, SystemStatus.ADDRESS, SystemStatus.COUNT, cfg.slave))
 
-    print(f"Initialised: {system.initialised}")
-    print(f"Other DIII devices: {system.other_device_exists}")
+    emit(f"Initialised: {system.initialised}")
+    emit(f"Other DIII devices: {system.other_device_exists}")
 
     found: list[int] = []
-    for index, connected in enumerate(system.units_connected):
-        if not connected or system.units_error[index]:
+    for index, (connected, error) in enumerate(zip(system.units_connected, system.units_error)):
+        if not connected or error:
             continue
         found.append(index)
 
-    print(f"\nFound {len(found)} healthy unit(s):")
+    cache = _load_cap_cache() if verbose else {}
+    cache_updated = False
+    capabilities: dict[int, UnitCapability] = {}
+    statuses: dict[int, list[int]] = {}
+    if verbose:
+        for index in found:
+            capability = _cached_capability(cache, cfg, index)
+            if capability is not None:
+                capabilities[index] = capability
+
+        missing = [index for index in found if index not in capabilities]
+        if missing:
+            now = time.time()
+            for index, registers in _read_input_bulk(
+                client, UnitCapability.ADDRESS, UnitCapability.COUNT, missing, cfg.slave
+            ).items():
+                capabilities[index] = UnitCapability(registers)
+                cache[_cap_cache_key(cfg, index)] = {"read_at": now, "registers": list(registers)}
+            cache_updated = True
+
+        statuses = _read_input_bulk(client, UnitStatus.ADDRESS, UnitStatus.COUNT, found, cfg.slave)
+
+    emit(f"\nFound {len(found)} healthy unit(s):")
     for index in found:
-        print(f"- idx={index:02d} id={_unit_id(index)}")
+        emit(f"- idx={index:02d} id={_unit_id(index)}")
         if verbose:
-            capability = UnitCapability(
-                _read_input(
-                    client,
-                    UnitCapability.ADDRESS + index * UnitCapability.COUNT,
-                    UnitCapability.COUNT,
-                    cfg.slave,
-                )
-            )
-            status = UnitStatus(
-                _read_input(
-                    client,
-                    UnitStatus.ADDRESS + index * UnitStatus.COUNT,
-                    UnitStatus.COUNT,
-                    cfg.slave,
-                )
-            )
-            print(
+            capability = capabilities[index]
+            status = UnitStatus(statuses[index])
+            emit(
                 f"  mode={status.operating_mode.name} power={status.power} "
                 f"setpoint={status.temp_setpoint:.1f}°C room={status.temp_current:.1f}°C "
                 f"fan={status.fan_speed.name}/{status.fan_direct.name} "
                 f"cap_modes={{cool:{capability.cool_mode_capable}, heat:{capability.heat_mode_capable}, auto:{capability.auto_mode_capable}, dry:{capability.dry_mode_capable}, fan:{capability.fan_mode_capable}}}"
             )
 
+    if cache_updated:
+        _save_cap_cache(cache)
+
     return found
 
 
+def _scan_ports(cfgs: list[RtuConfig], verbose: bool) -> bool:
+    """Scan several adapters concurrently, one client and thread per serial port.
+
+    A failing port is reported in its own section; returns False if any port failed.
+    """
+
+    def scan_one(cfg: RtuConfig) -> tuple[list[str], bool]:
+        lines: list[str] = []
+        client = _build_client(cfg)
+        try:
+            _connect_or_fail(client, cfg.port)
+            _scan_units(client, cfg, verbose=verbose, emit=lines.append)
+        except Exception as exc:  # noqa: BLE001 - keep the other ports' results
+            lines.append(f"ERROR: {exc}")
+            return lines, False
+        finally:
+            client.close()
+        return lines, True
+
+    with ThreadPoolExecutor(max_workers=len(cfgs)) as executor:
+        results = list(executor.map(scan_one, cfgs))
+
+    for cfg, (lines, _) in zip(cfgs, results):
+        print(f"== {cfg.port} ==")
+        for line in lines:
+            print(line)
+        print()
+    return all(ok for _, ok in results)
+
+
+def _format_status(index: int, status: UnitStatus) -> str:
+    mode_name = status.operating_mode.name
+    current_name = status.operating_current.name
+    fan_speed_name = status.fan_speed.name
+    fan_dir_name = status.fan_direct.name
+    return (
+        f"idx={index:02d} id={_unit_id(index)} power={status.power} "
+        f"mode={mode_name} current_mode={current_name} "
+        f"setpoint={status.temp_setpoint:.1f}°C room={status.temp_current:.1f}°C "
+        f"fan_speed={fan_speed_name} fan_dir={fan_dir_name} "
+        f"thermo={status.thermo} heat={status.heat} defrost={status.defrost} filter_warning={status.filter_warning}"
+    )
+
+
+def _write_lines(lines: list[str]) -> None:
+    """Write the report in one stdout write."""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
 def _show_status(client: Any, cfg: RtuConfig, units: Iterable[int]) -> None:
-    for index in units:
-        status = UnitStatus(
-            _read_input(
-                client,
-                UnitStatus.ADDRESS + index * UnitStatus.COUNT,
-                UnitStatus.COUNT,
-                cfg.slave,
-            )
-        )
-        print(
-            f"idx={index:02d} id={_unit_id(index)} power={status.power} "
-            f"mode={status.operating_mode.name} current_mode={status.operating_current.name} "
-            f"setpoint={status.temp_setpoint:.1f}°C room={status.temp_current:.1f}°C "
-            f"fan_speed={status.fan_speed.name} fan_dir={status.fan_direct.name} "
-            f"thermo={status.thermo} heat={status.heat} defrost={status.defrost} filter_warning={status.filter_warning}"
-        )
+    units = list(units)
+    statuses = _read_input_bulk(client, UnitStatus.ADDRESS, UnitStatus.COUNT, units, cfg.slave)
+    _write_lines([_format_status(index, UnitStatus(statuses[index])) for index in units])
 
 
 def _show_errors(client: Any, cfg: RtuConfig, units: Iterable[int], show_clear: bool) -> None:
+    units = list(units)
+    errors = _read_input_bulk(client, UnitError.ADDRESS, UnitError.COUNT, units, cfg.slave)
     has_any = False
     for index in units:
-        error = UnitError(
-            _read_input(
-                client,
-                UnitError.ADDRESS + index * UnitError.COUNT,
-                UnitError.COUNT,
-                cfg.slave,
-            )
-        )
+        error = UnitError(errors[index])
         if not show_clear and not (error.error or error.alarm or error.warning):
             continue
         has_any = True
@@ -210,14 +396,17 @@ def _show_errors(client: Any, cfg: RtuConfig, units: Iterable[int], show_clear:
 
 def _control_unit(client: Any, cfg: RtuConfig, args: argparse.Namespace) -> None:
     index = args.unit
-    holding = UnitHolding(
-        _read_holding(
-            client,
-            UnitHolding.ADDRESS + index * UnitHolding.COUNT,
-            UnitHolding.COUNT,
-            cfg.slave,
-        )
-    )
+    if args.mode is not None and args.mode in _MODE_CAPABILITY:
+        capability = _cached_capability(_load_cap_cache(), cfg, index)
+        if capability is not None and not getattr(capability, _MODE_CAPABILITY[args.mode]):
+            raise RuntimeError(
+                f"idx={index:02d} id={_unit_id(index)} does not support mode={args.mode.name} "
+                "(cached capability from 'scan --verbose')"
+            )
+
+    address = UnitHolding.ADDRESS + index * UnitHolding.COUNT
+    holding = UnitHolding(_read_holding(client, address, UnitHolding.COUNT, cfg.slave))
+    original = holding.registers
 
     changes = []
     if args.power is not None:
@@ -242,22 +431,13 @@ def _control_unit(client: Any, cfg: RtuConfig, args: argparse.Namespace) -> None
     if not holding.dirty:
         raise RuntimeError("No writable fields were changed. Provide at least one control option.")
 
-    _write_holding(
-        client,
-        UnitHolding.ADDRESS + index * UnitHolding.COUNT,
-        holding.registers,
-        cfg.slave,
-    )
+    written = holding.registers
+    _write_holding_changes(client, address, original, written, cfg.slave)
 
     if args.filter_reset:
+        # The unit needs a set-then-clear pulse, so the clear stays a second write
         holding.filter_reset = False
-        if holding.dirty:
-            _write_holding(
-                client,
-                UnitHolding.ADDRESS + index * UnitHolding.COUNT,
-                holding.registers,
-                cfg.slave,
-            )
+        _write_holding_changes(client, address, written, holding.registers, cfg.slave)
 
     print(f"Updated idx={index:02d} id={_unit_id(index)} with: {', '.join(changes)}")
 
@@ -265,57 +445,61 @@ def _control_unit(client: Any, cfg: RtuConfig, args: argparse.Namespace) -> None
 def _watch(client: Any, cfg: RtuConfig, args: argparse.Namespace) -> None:
     output = Path(args.out) if args.out else None
     iterations = None if args.duration <= 0 else int(args.duration / args.interval)
-
-    start = time.time()
+    dumps = json.dumps
+    # Fixed for the whole run
+    unit_id = _unit_id(args.unit)
+    status_address = UnitStatus.ADDRESS + args.unit * UnitStatus.COUNT
+    error_address = UnitError.ADDRESS + args.unit * UnitError.COUNT
+
+    file_handle = None
+    if output:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        # Line-buffered so each row reaches disk without reopening the file per tick
+        file_handle = output.open("a", encoding="utf-8", buffering=1)
+
+    start = time.monotonic()
     tick = 0
-    while iterations is None or tick <= iterations:
-        now = datetime.now(timezone.utc).isoformat()
-        status = UnitStatus(
-            _read_input(
-                client,
-                UnitStatus.ADDRESS + args.unit * UnitStatus.COUNT,
-                UnitStatus.COUNT,
-                cfg.slave,
-            )
-        )
-        error = UnitError(
-            _read_input(
-                client,
-                UnitError.ADDRESS + args.unit * UnitError.COUNT,
-                UnitError.COUNT,
-                cfg.slave,
+    try:
+        while iterations is None or tick <= iterations:
+            now = datetime.now(timezone.utc).isoformat()
+            status = UnitStatus(_read_input(client, status_address, UnitStatus.COUNT, cfg.slave))
+            error = UnitError(_read_input(client, error_address, UnitError.COUNT, cfg.slave))
+
+            # Fixed-key JSON line; only error_code can carry arbitrary characters.
+            line = (
+                f'{{"ts":"{now}","unit_index":{args.unit},"unit_id":"{unit_id}",'
+                f'"power":{str(status.power).lower()},"mode":"{status.operating_mode.name}",'
+                f'"setpoint":{status.temp_setpoint:.1f},"room_temp":{status.temp_current:.1f},'
+                f'"fan_speed":"{status.fan_speed.name}","fan_direction":"{status.fan_direct.name}",'
+                f'"error":{str(bool(error.error)).lower()},"alarm":{str(bool(error.alarm)).lower()},'
+                f'"warning":{str(bool(error.warning)).lower()},"error_code":{dumps(error.error_code)},'
+                f'"error_sub_code":{error.error_sub_code}}}'
             )
-        )
 
-        row = {
-            "ts": now,
-            "unit_index": args.unit,
-            "unit_id": _unit_id(args.unit),
-            "power": status.power,
-            "mode": status.operating_mode.name,
-            "setpoint": status.temp_setpoint,
-            "room_temp": status.temp_current,
-            "fan_speed": status.fan_speed.name,
-            "fan_direction": status.fan_direct.name,
-            "error": bool(error.error),
-            "alarm": bool(error.alarm),
-            "warning": bool(error.warning),
-            "error_code": error.error_code,
-            "error_sub_code": error.error_sub_code,
-        }
-
-        print(json.dumps(row, separators=(",", ":")))
-        if output:
-            output.parent.mkdir(parents=True, exist_ok=True)
-            with output.open("a", encoding="utf-8") as file_handle:
-                file_handle.write(json.dumps(row) + "\n")
-
-        tick += 1
-        if iterations is not None and tick > iterations:
-            break
-        time.sleep(args.interval)
-
-    elapsed = time.time() - start
+            print(line)
+            if file_handle:
+                file_handle.write(line + "\n")
+
+            tick += 1
+            if iterations is not None and tick > iterations:
+                break
+            if args.interval <= 0:
+                continue  # poll back-to-back, no schedule to keep
+            # Sleep to the next slot on a fixed grid so read/print time never accumulates as drift
+            current = time.monotonic()
+            next_tick = start + tick * args.interval
+            if next_tick < current:
+                # Behind (slow bus): skip the missed slots rather than polling back-to-back
+                tick += int((current - next_tick) // args.interval) + 1
+                if iterations is not None and tick > iterations:
+                    break
+                next_tick = start + tick * args.interval
+            time.sleep(next_tick - current)
+    finally:
+        if file_handle:
+            file_handle.close()
+
+    elapsed = time.monotonic() - start
     print(f"Finished watch after {elapsed:.1f}s")
 
 
@@ -334,13 +518,23 @@ def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Daikin DTA116A51 Modbus RTU utility over USB-RS485 adapters.",
     )
-    parser.add_argument("--port", help="Serial port, e.g. /dev/ttyUSB0 or COM4")
+    parser.add_argument(
+        "--port",
+        action="append",
+        help="Serial port, e.g. /dev/ttyUSB0 or COM4 (repeat to scan several adapters)",
+    )
     parser.add_argument("--baudrate", type=int, default=9600)
     parser.add_argument("--bytesize", type=int, choices=[7, 8], default=8)
     parser.add_argument("--parity", choices=["N", "E", "O"], default="E")
     parser.add_argument("--stopbits", type=int, choices=[1, 2], default=1)
     parser.add_argument("--timeout", type=float, default=1.0, help="Serial timeout in seconds")
     parser.add_argument("--slave", type=int, default=1, help="Modbus slave id on DTA adapter")
+    parser.add_argument(
+        "--poll-interval-ms",
+        dest="poll_interval_ms",
+        type=float,
+        help="How often pymodbus polls the port for response bytes, in ms (default: ~4 character times)",
+    )
 
     sub = parser.add_subparsers(dest="command", required=True)
 
@@ -395,19 +589,26 @@ def main() -> int:
 
     if not args.port:
         parser.error("--port is required for this command")
+    if len(args.port) > 1 and args.command != "scan":
+        parser.error("--port can only be repeated for scan")
 
     cfg = RtuConfig(
-        port=args.port,
+        port=args.port[0],
         baudrate=args.baudrate,
         bytesize=args.bytesize,
         parity=args.parity,
         stopbits=args.stopbits,
         timeout=args.timeout,
         slave=args.slave,
+        poll_interval_ms=args.poll_interval_ms,
     )
 
     client = None
     try:
+        if len(args.port) > 1:
+            ok = _scan_ports([replace(cfg, port=port) for port in args.port], verbose=args.verbose)
+            return 0 if ok else 1
+
         client = _build_client(cfg)
         _connect_or_fail(client, cfg.port)
 
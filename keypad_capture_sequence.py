@@ -14,52 +14,32 @@ Defaults: COM3, 19200 baud, 8N1. Adjust PORT/BAUD constants if needed.
 Run: python keypad_capture_sequence.py
 """
 
-import binascii
 import time
 from collections import Counter
 from pathlib import Path
 
 import serial
 
+from rnet_frames import KEYPAD_FRAME_LENGTHS, scan, read_available
+
 PORT = "COM3"
 BAUD = 19200
 WINDOW_SECONDS = 6
 GAP_SECONDS = 5
 
 
-def crc16_ccitt(data: bytes) -> int:
-    return binascii.crc_hqx(data, 0xFFFF) & 0xFFFF
-
-
-def capture_window(ser: serial.Serial, seconds: float) -> bytes:
+def capture_window(ser: serial.Serial, seconds: float) -> bytearray:
     end = time.time() + seconds
     buf = bytearray()
     while time.time() < end:
-        buf.extend(ser.read(4096))
-        time.sleep(0.005)
-    return bytes(buf)
+        buf.extend(read_available(ser))
+    return buf
 
 
 def find_frames(blob: bytes):
-    """Yield CRC‑valid frames (len 4..39) framed on 0x02 start."""
-    i = 0
-    while i < len(blob) - 4:
-        if blob[i] != 0x02:
-            i += 1
-            continue
-        matched = False
-        for L in range(4, 40):
-            if i + L > len(blob):
-                break
-            data = blob[i + 1 : i + L - 2]
-            stored = (blob[i + L - 2] << 8) | blob[i + L - 1]
-            if crc16_ccitt(data) == stored:
-                yield bytes(blob[i : i + L])
-                i += L
-                matched = True
-                break
-        if not matched:
-            i += 1
+    """Yield CRC‑valid frames framed on 0x02 start."""
+    for i, L in scan(blob, lengths=KEYPAD_FRAME_LENGTHS):
+        yield bytes(blob[i : i + L])
 
 
 def summarize(frames):
@@ -72,7 +52,7 @@ def summarize(frames):
 
 
 def main():
-    ser = serial.Serial(PORT, BAUD, bytesize=8, parity="N", stopbits=1, timeout=0)
+    ser = serial.Serial(PORT, BAUD, bytesize=8, parity="N", stopbits=1, timeout=0.05)
     print(f"Opened {PORT} @ {BAUD}.")
 
     buttons = ["1", "2", "3", "4"]
@@ -94,8 +74,7 @@ def main():
     txt_path = logdir / f"keypad_capture_{ts}.txt"
 
     bin_path.write_bytes(all_bytes)
-    frames = list(find_frames(all_bytes))
-    summary = summarize(frames)
+    summary = summarize(find_frames(all_bytes))
     txt_path.write_text(summary, encoding="utf-8")
 
     print(f"\nCapture complete. Raw: {bin_path}  Summary: {txt_path}")
@@ -14,12 +14,13 @@ Usage:
 Stop with Ctrl+C.
 """
 
-import binascii
 import time
 from pathlib import Path
 
 import serial
 
+from rnet_frames import KEYPAD_FRAME_LENGTHS, consume_frames, read_available
+
 PORT = "COM3"
 BAUD = 19200
 
@@ -28,38 +29,16 @@ BTN1_PAYLOADS = {
     (0x00, 0x00, 0x03, 0x00),
     (0x01, 0x00, 0x03, 0x00),
 }
-
-
-def crc16_ccitt(data: bytes) -> int:
-    return binascii.crc_hqx(data, 0xFFFF) & 0xFFFF
+# Same patterns packed big-endian so a frame is classified with one int lookup
+BTN1_KEYS = frozenset(int.from_bytes(bytes(p), "big") for p in BTN1_PAYLOADS)
 
 
 def decode_frames(buf: bytearray):
     """
-    Extract CRC-valid frames (len 4..39) framed on 0x02 start.
-    Returns (frames, leftover) so partial trailing data is preserved.
+    Extract CRC-valid frames framed on 0x02 start.
+    Consumed bytes are removed from `buf`; a trailing partial frame is kept.
     """
-    frames = []
-    i = 0
-    while i < len(buf) - 4:
-        if buf[i] != 0x02:
-            i += 1
-            continue
-        matched = False
-        for L in range(4, 40):
-            if i + L > len(buf):
-                break  # not enough data yet
-            data = buf[i + 1 : i + L - 2]
-            stored = (buf[i + L - 2] << 8) | buf[i + L - 1]
-            if crc16_ccitt(data) == stored:
-                frames.append(bytes(buf[i : i + L]))
-                i += L
-                matched = True
-                break
-        if not matched:
-            i += 1
-    leftover = bytes(buf[i:])  # keep tail that might be partial frame
-    return frames, leftover
+    return consume_frames(buf, lengths=KEYPAD_FRAME_LENGTHS)
 
 
 def is_btn1_press(frame: bytes) -> bool:
@@ -67,12 +46,12 @@ def is_btn1_press(frame: bytes) -> bool:
         return False
     if frame[1] != 0x80:  # require keypad->gateway direction
         return False
-    return tuple(frame[4:8]) in BTN1_PAYLOADS
+    return int.from_bytes(frame[4:8], "big") in BTN1_KEYS
 
 
 def main():
     try:
-        ser = serial.Serial(PORT, BAUD, bytesize=8, parity="N", stopbits=1, timeout=0)
+        ser = serial.Serial(PORT, BAUD, bytesize=8, parity="N", stopbits=1, timeout=0.05)
     except Exception as exc:
         print(f"Could not open {PORT}: {exc}")
         return
@@ -88,11 +67,9 @@ def main():
     count = 0
     try:
         while True:
-            buf.extend(ser.read(4096))
-            frames, leftover = decode_frames(buf)
-            buf = bytearray(leftover)
+            buf.extend(read_available(ser))
+            frames = decode_frames(buf)
             if not frames:
-                time.sleep(0.01)
                 continue
             now = time.time()
             for fr in frames:
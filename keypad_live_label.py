@@ -14,10 +14,11 @@ Run: python keypad_live_label.py
 Adjust PORT/BAUD below if needed.
 """
 
-import binascii
 import time
 import serial
 
+from rnet_frames import KEYPAD_FRAME_LENGTHS, consume_frames, read_available
+
 PORT = "COM3"
 BAUD = 19200
 
@@ -36,34 +37,13 @@ PAYLOAD_TO_BTN = {
     (0x00, 0x00, 0xC0, 0x00): ("BTN4", "main"),
     (0x08, 0x00, 0xC0, 0x00): ("BTN4", "main"),
 }
+# Same table keyed by the payload packed big-endian, for one int lookup per frame
+BTN_TABLE = {int.from_bytes(bytes(k), "big"): v for k, v in PAYLOAD_TO_BTN.items()}
 
 
-def crc16_ccitt(data: bytes) -> int:
-    return binascii.crc_hqx(data, 0xFFFF) & 0xFFFF
-
-
-def decode_frames(blob: bytearray):
-    """Yield CRC-valid frames (len 4..39) framed on 0x02 start."""
-    i = 0
-    out = []
-    while i < len(blob) - 4:
-        if blob[i] != 0x02:
-            i += 1
-            continue
-        matched = False
-        for L in range(4, 40):
-            if i + L > len(blob):
-                break
-            data = blob[i + 1 : i + L - 2]
-            stored = (blob[i + L - 2] << 8) | blob[i + L - 1]
-            if crc16_ccitt(data) == stored:
-                out.append(bytes(blob[i : i + L]))
-                i += L
-                matched = True
-                break
-        if not matched:
-            i += 1
-    return out
+def decode_frames(buf: bytearray):
+    """Return CRC-valid frames framed on 0x02 start, removing them from `buf`."""
+    return consume_frames(buf, lengths=KEYPAD_FRAME_LENGTHS)
 
 
 def label_frame(frame: bytes):
@@ -72,8 +52,7 @@ def label_frame(frame: bytes):
     # frame layout observed: 02 [dir] 12 0e P0 P1 P2 P3 ... CRC
     dir_byte = frame[1]
     p = frame[4:8]
-    key = tuple(p)
-    btn_info = PAYLOAD_TO_BTN.get(key)
+    btn_info = BTN_TABLE.get(int.from_bytes(p, "big"))
 
     # Heuristic event type:
     # - dir 0x80 (keypad->gateway) with BTN payload -> PRESS
@@ -95,15 +74,13 @@ def label_frame(frame: bytes):
 
 
 def main():
-    ser = serial.Serial(PORT, BAUD, bytesize=8, parity="N", stopbits=1, timeout=0)
+    ser = serial.Serial(PORT, BAUD, bytesize=8, parity="N", stopbits=1, timeout=0.05)
     print(f"Listening on {PORT}@{BAUD}. Press buttons; Ctrl+C to stop.")
     buf = bytearray()
     try:
         while True:
-            buf.extend(ser.read(4096))
+            buf.extend(read_available(ser))
             frames = decode_frames(buf)
-            if frames:
-                buf.clear()  # consume
             ts = time.time()
             for fr in frames:
                 label = label_frame(fr)
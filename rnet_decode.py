@@ -29,7 +29,11 @@ def crc16_ccitt(data: bytes, init: int = 0xFFFF) -> int:
 
 
 def parse_frames(blob: bytes):
-    markers = [i for i in range(len(blob) - 1) if blob[i] == 0x02 and blob[i + 1] == 0x7E]
+    markers = []
+    pos = blob.find(b"\x02\x7E")
+    while pos >= 0:
+        markers.append(pos)
+        pos = blob.find(b"\x02\x7E", pos + 1)
     for idx, pos in enumerate(markers):
         end = markers[idx + 1] if idx + 1 < len(markers) else len(blob)
         frame = blob[pos:end]
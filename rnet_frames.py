@@ -0,0 +1,92 @@
+"""
+Shared RNET frame scanner used by the keypad capture/live scripts.
+
+Frame layout (see README, RNET sniffing notes):
+  02 <payload ...> <crc_hi> <crc_lo>
+CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) over the bytes after the
+leading 0x02, stored big-endian.
+"""
+
+import binascii
+
+MIN_FRAME_LEN = 4
+MAX_FRAME_LEN = 39
+# Frame sizes the keypad scripts look for; None scans every length 4..39
+KEYPAD_FRAME_LENGTHS = (23,)
+
+
+def _build_crc_table() -> tuple[int, ...]:
+    table = []
+    for byte in range(256):
+        crc = byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else crc << 1
+        table.append(crc & 0xFFFF)
+    return tuple(table)
+
+
+# Byte-at-a-time table for poly 0x1021, used when a CRC is extended one byte at a time
+_CRC_TABLE = _build_crc_table()
+
+
+def crc16_ccitt(data: bytes) -> int:
+    """CRC-16/CCITT-FALSE over `data`."""
+    return binascii.crc_hqx(data, 0xFFFF)
+
+
+def read_available(ser) -> bytes:
+    """Block for the first byte (up to the port timeout), then return everything queued."""
+    return ser.read(max(1, ser.in_waiting))
+
+
+def scan(buf, start: int = 0, lengths=None):
+    """
+    Yield (offset, length) for CRC-valid frames framed on 0x02.
+
+    `lengths` restricts matching to known frame sizes (ascending), hashing one
+    sliced window per size; None tries every length 4..39 with a single running
+    CRC per start byte. Works on bytes or bytearray.
+    """
+    n = len(buf)
+    table = _CRC_TABLE
+    # find() moves to the next 0x02 start byte
+    i = buf.find(b"\x02", start)
+    while 0 <= i < n - 4:
+        next_i = i + 1
+        if lengths is not None:
+            for L in lengths:
+                if i + L > n:
+                    break
+                if crc16_ccitt(buf[i + 1 : i + L - 2]) == (buf[i + L - 2] << 8) | buf[i + L - 1]:
+                    yield i, L
+                    next_i = i + L
+                    break
+        else:
+            # One running CRC per start byte, extended a byte at a time through the table
+            crc = 0xFFFF
+            for L in range(MIN_FRAME_LEN, min(MAX_FRAME_LEN, n - i) + 1):
+                crc = ((crc << 8) & 0xFFFF) ^ table[(crc >> 8) ^ buf[i + L - 3]]
+                if crc == (buf[i + L - 2] << 8) | buf[i + L - 1]:
+                    yield i, L
+                    next_i = i + L
+                    break
+        i = buf.find(b"\x02", next_i)
+
+
+def consume_frames(buf: bytearray, lengths=None) -> list[bytes]:
+    """
+    Pop complete frames off the front of a growing receive buffer.
+
+    Everything before the first 0x02 that could still start an incomplete
+    frame is dropped in place, so the buffer stays bounded and each read only
+    rescans that short tail.
+    """
+    frames = []
+    end = 0
+    for i, L in scan(buf, lengths=lengths):
+        frames.append(bytes(buf[i : i + L]))
+        end = i + L
+    longest = MAX_FRAME_LEN if lengths is None else max(lengths)
+    keep = buf.find(b"\x02", max(end, len(buf) - longest + 1))
+    del buf[: keep if keep >= 0 else len(buf)]
+    return frames
@@ -9,9 +9,11 @@ Usage examples:
   python rnet_logger.py --duration 30 # 30‑second capture
   python rnet_logger.py --outfile m8.txt --raw m8.bin
   python rnet_logger.py --port COM4 --baud 19200 --parity E --stopbits 1
+  python rnet_logger.py --durable     # fsync the logs on every 1 s flush
 """
 
 import argparse
+import os
 import sys
 import time
 from pathlib import Path
@@ -32,6 +34,16 @@ STOPBITS_MAP = {
     "2": serial.STOPBITS_TWO,
 }
 
+# Write buffered log data early once either buffer grows past this
+FLUSH_BYTES = 64 * 1024
+
+
+def positive_float(value: str) -> float:
+    seconds = float(value)
+    if not seconds > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0, got {value}")
+    return seconds
+
 
 def parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(description="Timestamped RS‑485 logger for ROEHN RNET bus")
@@ -55,7 +67,18 @@ def parse_args() -> argparse.Namespace:
         "--chunk",
         type=int,
         default=4096,
-        help="Read buffer size per iteration (default: 4096)",
+        help="Max bytes drained per iteration (default: 4096)",
+    )
+    p.add_argument(
+        "--read-timeout",
+        type=positive_float,
+        default=0.05,
+        help="Blocking serial read timeout in seconds (default: 0.05)",
+    )
+    p.add_argument(
+        "--durable",
+        action="store_true",
+        help="fsync the log files on every periodic flush (survives power loss, costs a disk sync per second)",
     )
     return p.parse_args()
 
@@ -67,10 +90,11 @@ def open_ports(args: argparse.Namespace):
         bytesize=serial.EIGHTBITS,
         parity=PARITY_MAP[args.parity],
         stopbits=STOPBITS_MAP[args.stopbits],
-        timeout=0,  # non‑blocking
+        timeout=args.read_timeout,  # block in the driver until bytes arrive or the timeout expires
     )
     text_path = Path(args.outfile)
-    text_file = text_path.open("a", encoding="ascii", buffering=1)
+    # Unbuffered: log_loop batches lines itself and writes them in one call per flush
+    text_file = text_path.open("ab", buffering=0)
     raw_file = None
     if args.raw:
         raw_file = Path(args.raw).open("ab", buffering=0)
@@ -79,39 +103,54 @@ def open_ports(args: argparse.Namespace):
 
 def log_loop(args: argparse.Namespace):
     ser, text_file, raw_file = open_ports(args)
-    start = time.time()
+    text_buf = bytearray()
+    raw_buf = bytearray()
+
+    def drain():
+        if text_buf:
+            text_file.write(text_buf)
+            text_buf.clear()
+        if raw_buf:
+            raw_file.write(raw_buf)
+            raw_buf.clear()
+        if args.durable:
+            os.fsync(text_file.fileno())
+            if raw_file:
+                os.fsync(raw_file.fileno())
+
+    start = time.monotonic()
     next_flush = start + 1.0
     try:
         while True:
-            if args.duration and (time.time() - start) >= args.duration:
+            # One monotonic reading drives the duration and flush checks; wall time only for log lines
+            now = time.monotonic()
+            if args.duration and (now - start) >= args.duration:
                 break
 
-            data = ser.read(args.chunk)
+            # Block for the first byte, then drain whatever else the driver already holds;
+            # read(chunk) would sit out the full timeout whenever a burst is shorter than chunk
+            data = ser.read(1)
+            if data:
+                waiting = ser.in_waiting
+                if waiting:
+                    data += ser.read(min(waiting, args.chunk - 1))
             if data:
                 ts = time.time()
-                hex_line = " ".join(f"{b:02X}" for b in data)
-                text_file.write(f"{ts:.6f} {hex_line}\n")
+                hex_line = data.hex(" ").upper()
+                text_buf += f"{ts:.6f} {hex_line}\n".encode("ascii")
                 if raw_file:
-                    raw_file.write(data)
+                    raw_buf += data
 
-            # periodic flush keeps data on disk even if interrupted
-            now = time.time()
-            if now >= next_flush:
-                text_file.flush()
-                if raw_file:
-                    raw_file.flush()
+            # periodic flush keeps data on disk even if interrupted; one write per file per tick
+            if now >= next_flush or len(text_buf) > FLUSH_BYTES or len(raw_buf) > FLUSH_BYTES:
+                drain()
                 next_flush = now + 1.0
-
-            # avoid a tight CPU loop when bus is idle
-            if not data:
-                time.sleep(0.005)
     except KeyboardInterrupt:
         pass
     finally:
-        text_file.flush()
+        drain()
         text_file.close()
         if raw_file:
-            raw_file.flush()
             raw_file.close()
         ser.close()
 
@@ -6,17 +6,33 @@ from __future__ import annotations
 import argparse
 import ipaddress
 import json
+import selectors
 import socket
+import struct
+import sys
 import time
+from bisect import bisect_right
 from dataclasses import asdict, dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 
 HEADER = b"HSN_S-UDP"
 
+# ip, mask, gateway, mac at offset 62 of a discover reply
+_PROCESSOR_NET = struct.Struct("4s4s4s6s")
+# 40-byte device record: status, port, pad, hsnet_id, device_id, dev_model, fw x3,
+# model, extended_model, serial, crc (big-endian, as two bytes), eeprom_address, bitmap
+_DEVICE_RECORD = struct.Struct("<BBxHHBBBB7s10s6sBBHH")
+# BIOS reply from offset 12: version x3, max_modules, max_units, pad, event_block,
+# string_var_block, pad, then max/cad pairs for scripts, procedures, vars and scenes
+_BIOS = struct.Struct("<BBBBH2xHH2x8H")
+# Packet lengths at which each BIOS field above becomes complete
+_BIOS_FIELD_ENDS = (15, 16, 18, 22, 24, 28, 30, 32, 34, 36, 38, 40, 42)
 
-@dataclass
+
+@dataclass(slots=True)
 class ProcessorInfo:
     source_ip: str
     name: str
@@ -28,7 +44,7 @@ class ProcessorInfo:
     mac: str = ""
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceInfo:
     processor_ip: str
     port: int
@@ -45,7 +61,7 @@ class DeviceInfo:
     bitmap: int
 
 
-@dataclass
+@dataclass(slots=True)
 class BiosInfo:
     version: str
     major_version: int
@@ -69,25 +85,31 @@ def c_string(data: bytes, start: int, max_len: int | None = None) -> str:
     if start < 0 or start >= len(data):
         return ""
     end = len(data) if max_len is None else min(len(data), start + max_len)
-    chunk = data[start:end]
-    nul = chunk.find(b"\x00")
+    # Stop at the first NUL inside the window, then decode that span
+    nul = data.find(b"\x00", start, end)
     if nul >= 0:
-        chunk = chunk[:nul]
-    return chunk.decode("ascii", errors="ignore").strip()
+        end = nul
+    return str(memoryview(data)[start:end], "ascii", "ignore").strip()
+
+
+_DISCOVER_PACKET = HEADER + b"\x03\x00\x00\x00"
+_GET_BIOS_PACKET = HEADER + b"\x04\x09\x00"
+# header, command 100, sub 1, read_index (LE), 0
+_GET_CONNECTED_DEVICES = struct.Struct("<9sBBHB")
 
 
 def build_discover_packet() -> bytes:
-    return HEADER + bytes((3, 0, 0, 0))
+    return _DISCOVER_PACKET
 
 
 def build_get_connected_devices_packet(read_index: int) -> bytes:
     if read_index < 0:
         read_index = 0
-    return HEADER + bytes((100, 1, read_index & 0xFF, (read_index >> 8) & 0xFF, 0))
+    return _GET_CONNECTED_DEVICES.pack(HEADER, 100, 1, read_index & 0xFFFF, 0)
 
 
 def build_get_bios_packet() -> bytes:
-    return HEADER + bytes((4, 9, 0))
+    return _GET_BIOS_PACKET
 
 
 def parse_serial_hex(serial_text: str) -> bytes:
@@ -103,25 +125,15 @@ def parse_serial_hex(serial_text: str) -> bytes:
     return bytes(out)
 
 
+# Matches IdentifyModuleBySerialNumberCallObject.GetNextDataBlock(); serial at 17..22, beep at 27
+_IDENTIFY_TEMPLATE = HEADER + bytes((1, 1, 0, 16, 125, 1, 0xFF, 0)) + bytes(6) + bytes((4, 238, 0, 0, 0))
+
+
 def build_identify_packet(serial: bytes, beep: bool) -> bytes:
     if len(serial) != 6:
         raise ValueError("serial must be 6 bytes")
-    # Matches IdentifyModuleBySerialNumberCallObject.GetNextDataBlock()
-    data = bytearray(28)
-    data[0:9] = HEADER
-    data[9] = 1
-    data[10] = 1
-    data[11] = 0
-    data[12] = 16
-    data[13] = 125
-    data[14] = 1
-    data[15] = 0xFF
-    data[16] = 0
+    data = bytearray(_IDENTIFY_TEMPLATE)
     data[17:23] = serial
-    data[23] = 4
-    data[24] = 238
-    data[25] = 0
-    data[26] = 0
     data[27] = 1 if beep else 0
     return bytes(data)
 
@@ -138,10 +150,11 @@ def parse_processor_response(data: bytes, source_ip: str) -> ProcessorInfo | Non
     if len(data) >= 82:
         info.version = f"{data[32]}.{data[33]}.{data[34]}.{data[35]}"
         info.serial = c_string(data, 42, 16)
-        info.ip = ".".join(str(x) for x in data[62:66])
-        info.mask = ".".join(str(x) for x in data[66:70])
-        info.gateway = ".".join(str(x) for x in data[70:74])
-        info.mac = ":".join(f"{x:02X}" for x in data[74:80])
+        ip, mask, gateway, mac = _PROCESSOR_NET.unpack_from(data, 62)
+        info.ip = socket.inet_ntoa(ip)
+        info.mask = socket.inet_ntoa(mask)
+        info.gateway = socket.inet_ntoa(gateway)
+        info.mac = mac.hex(":").upper()
     return info
 
 
@@ -162,26 +175,39 @@ def parse_devices_response(data: bytes, source_ip: str) -> tuple[list[DeviceInfo
     base = 9 + 3 + header_len
     for i in range(registers_qty):
         pos = base + i * register_len
-        if pos + 40 > len(data):
+        if pos + _DEVICE_RECORD.size > len(data):
             break
-        serial = data[pos + 28 : pos + 34]
+        (
+            status,
+            port,
+            hsnet_id,
+            device_id,
+            dev_model,
+            fw_major,
+            fw_minor,
+            fw_patch,
+            model,
+            extended_model,
+            serial,
+            crc_hi,
+            crc_lo,
+            eeprom_address,
+            bitmap,
+        ) = _DEVICE_RECORD.unpack_from(data, pos)
         d = DeviceInfo(
             processor_ip=source_ip,
-            status=data[pos],
-            port=data[pos + 1],
-            hsnet_id=data[pos + 3] | (data[pos + 4] << 8),
-            device_id=data[pos + 5] | (data[pos + 6] << 8),
-            dev_model=data[pos + 7],
-            fw=f"{data[pos + 8]}.{data[pos + 9]}.{data[pos + 10]}",
-            model=data[pos + 11 : pos + 18].decode("ascii", errors="ignore").replace("\x00", "").strip(),
-            extended_model=data[pos + 18 : pos + 28]
-            .decode("ascii", errors="ignore")
-            .replace("\x00", "")
-            .strip(),
-            serial_hex=":".join(f"{b:02X}" for b in serial),
-            crc=(data[pos + 34] << 8) | data[pos + 35],
-            eeprom_address=data[pos + 36] | (data[pos + 37] << 8),
-            bitmap=data[pos + 38] | (data[pos + 39] << 8),
+            status=status,
+            port=port,
+            hsnet_id=hsnet_id,
+            device_id=device_id,
+            dev_model=dev_model,
+            fw=f"{fw_major}.{fw_minor}.{fw_patch}",
+            model=model.decode("ascii", errors="ignore").replace("\x00", "").strip(),
+            extended_model=extended_model.decode("ascii", errors="ignore").replace("\x00", "").strip(),
+            serial_hex=serial.hex(":").upper(),
+            crc=(crc_hi << 8) | crc_lo,
+            eeprom_address=eeprom_address,
+            bitmap=bitmap,
         )
         devices.append(d)
     return devices, registers_qty, read_index
@@ -194,41 +220,43 @@ def parse_bios_response(data: bytes) -> BiosInfo | None:
         return None
     if data[9] != 4 or data[10] != 9:
         return None
-    major = int(data[12])
-    minor = int(data[13])
-    patch = int(data[14])
+    # Fixed layout; a short reply leaves the fields it does not fully cover at 0
+    complete = _BIOS_FIELD_ENDS[bisect_right(_BIOS_FIELD_ENDS, len(data)) - 1]
+    (
+        major,
+        minor,
+        patch,
+        max_modules,
+        max_units,
+        event_block,
+        string_var_block,
+        max_scripts,
+        cad_scripts,
+        max_procedures,
+        cad_procedures,
+        max_var,
+        cad_var,
+        max_scenes,
+        cad_scenes,
+    ) = _BIOS.unpack(data[12:complete].ljust(_BIOS.size, b"\x00"))
     info = BiosInfo(
         version=f"{major}.{minor}.{patch}",
         major_version=major,
         minor_version=minor,
         patch_version=patch,
+        max_modules=max_modules,
+        max_units=max_units,
+        event_block=event_block,
+        string_var_block=string_var_block,
+        max_scripts=max_scripts,
+        cad_scripts=cad_scripts,
+        max_procedures=max_procedures,
+        cad_procedures=cad_procedures,
+        max_var=max_var,
+        cad_var=0 if cad_var > 65000 else cad_var,
+        max_scenes=max_scenes,
+        cad_scenes=cad_scenes,
     )
-    if len(data) >= 16:
-        info.max_modules = int(data[15])
-    if len(data) >= 18:
-        info.max_units = int(data[16]) | (int(data[17]) << 8)
-    if len(data) >= 22:
-        info.event_block = int(data[20]) | (int(data[21]) << 8)
-    if len(data) >= 24:
-        info.string_var_block = int(data[22]) | (int(data[23]) << 8)
-    if len(data) >= 28:
-        info.max_scripts = int(data[26]) | (int(data[27]) << 8)
-    if len(data) >= 30:
-        info.cad_scripts = int(data[28]) | (int(data[29]) << 8)
-    if len(data) >= 32:
-        info.max_procedures = int(data[30]) | (int(data[31]) << 8)
-    if len(data) >= 34:
-        info.cad_procedures = int(data[32]) | (int(data[33]) << 8)
-    if len(data) >= 36:
-        info.max_var = int(data[34]) | (int(data[35]) << 8)
-    if len(data) >= 38:
-        info.cad_var = int(data[36]) | (int(data[37]) << 8)
-        if info.cad_var > 65000:
-            info.cad_var = 0
-    if len(data) >= 40:
-        info.max_scenes = int(data[38]) | (int(data[39]) << 8)
-    if len(data) >= 42:
-        info.cad_scenes = int(data[40]) | (int(data[41]) << 8)
     return info
 
 
@@ -236,11 +264,31 @@ def processor_key(p: ProcessorInfo) -> tuple[str, str]:
     return (p.serial or "", p.ip or p.source_ip)
 
 
+def sort_processors(processors: Iterable[ProcessorInfo]) -> list[ProcessorInfo]:
+    """Order by (ip, serial); the position breaks ties so ProcessorInfo itself is never compared."""
+    decorated = [(p.ip or p.source_ip, p.serial, i, p) for i, p in enumerate(processors)]
+    decorated.sort()
+    return [item[3] for item in decorated]
+
+
 def merge_processors(dst: dict[tuple[str, str], ProcessorInfo], items: list[ProcessorInfo]) -> None:
     for item in items:
         dst[processor_key(item)] = item
 
 
+def receive_datagrams(sock: socket.socket, deadline: float, bufsize: int = 4096):
+    """Yield (data, source_ip) as datagrams arrive until the time.monotonic() `deadline`."""
+    with selectors.DefaultSelector() as selector:
+        selector.register(sock, selectors.EVENT_READ)
+        while True:
+            remaining = deadline - time.monotonic()
+            # Wait for the next datagram until the deadline; stop once nothing arrives in time
+            if remaining <= 0 or not selector.select(remaining):
+                return
+            data, (src_ip, _) = sock.recvfrom(bufsize)
+            yield data, src_ip
+
+
 def discover_processors_broadcast(
     port: int,
     timeout: float,
@@ -256,18 +304,12 @@ def discover_processors_broadcast(
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_BROADCAST, 1)
         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         sock.bind(("", 0))
-        sock.settimeout(0.2)
 
         for _ in range(max(1, probes)):
             sock.sendto(packet, (broadcast_ip, port))
             time.sleep(max(0.0, probe_interval))
 
-        deadline = time.time() + timeout
-        while time.time() < deadline:
-            try:
-                data, (src_ip, _) = sock.recvfrom(4096)
-            except socket.timeout:
-                continue
+        for data, src_ip in receive_datagrams(sock, time.monotonic() + timeout):
             info = parse_processor_response(data, src_ip)
             if not info:
                 continue
@@ -275,15 +317,27 @@ def discover_processors_broadcast(
     finally:
         sock.close()
 
-    return sorted(found.values(), key=lambda x: (x.ip or x.source_ip, x.serial))
+    return sort_processors(found.values())
+
+
+_IPV4_ADDR = struct.Struct("!I")
 
 
 def hosts_from_subnet(subnet_cidr: str, limit: int) -> list[str]:
     net = ipaddress.ip_network(subnet_cidr, strict=False)
-    hosts = [str(h) for h in net.hosts()]
-    if limit > 0:
-        hosts = hosts[:limit]
-    return hosts
+    if net.version != 4:
+        hosts = [str(h) for h in net.hosts()]
+        return hosts[:limit] if limit > 0 else hosts
+
+    # Yield host addresses from the integer range, stopping after `limit` when set
+    first = int(net.network_address)
+    last = int(net.broadcast_address)
+    if net.prefixlen < 31:
+        first += 1  # network address
+        last -= 1  # broadcast address
+    stop = last + 1 if limit <= 0 else min(last + 1, first + limit)
+    pack = _IPV4_ADDR.pack
+    return [socket.inet_ntoa(pack(n)) for n in range(first, stop)]
 
 
 def discover_processors_unicast(
@@ -294,28 +348,31 @@ def discover_processors_unicast(
 ) -> list[ProcessorInfo]:
     found: dict[tuple[str, str], ProcessorInfo] = {}
     packet = build_discover_packet()
-    per_probe_timeout = max(0.02, min(0.2, timeout / 10.0 if timeout > 0 else 0.05))
+
+    # Hosts that have not answered yet; later probes go only to these
+    silent = set(hosts)
 
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
         sock.bind(("", 0))
-        sock.settimeout(per_probe_timeout)
         for _ in range(max(1, probes)):
+            if not silent:
+                break
+            # Whole burst goes out before listening, so replies queue up while we send
             for host in hosts:
-                sock.sendto(packet, (host, port))
-            deadline = time.time() + timeout
-            while time.time() < deadline:
-                try:
-                    data, (src_ip, _) = sock.recvfrom(4096)
-                except socket.timeout:
-                    continue
+                if host in silent:
+                    sock.sendto(packet, (host, port))
+            for data, src_ip in receive_datagrams(sock, time.monotonic() + timeout):
                 info = parse_processor_response(data, src_ip)
                 if not info:
                     continue
                 found[processor_key(info)] = info
+                silent.discard(src_ip)
+                if not silent:
+                    break
     finally:
         sock.close()
-    return sorted(found.values(), key=lambda x: (x.ip or x.source_ip, x.serial))
+    return sort_processors(found.values())
 
 
 def discover_processors(
@@ -351,25 +408,27 @@ def discover_processors(
             ),
         )
 
-    return sorted(merged.values(), key=lambda x: (x.ip or x.source_ip, x.serial))
+    return sort_processors(merged.values())
 
 
-def query_devices(ip: str, port: int, timeout: float, max_pages: int) -> list[DeviceInfo]:
+def query_devices(
+    ip: str,
+    port: int,
+    timeout: float,
+    max_pages: int,
+    sock: socket.socket | None = None,
+) -> list[DeviceInfo]:
     all_devices: list[DeviceInfo] = []
     read_index = 0
 
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    own_sock = sock is None
+    if own_sock:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
-        sock.settimeout(timeout)
         for _ in range(max_pages):
             sock.sendto(build_get_connected_devices_packet(read_index), (ip, port))
-            deadline = time.time() + timeout
             parsed: tuple[list[DeviceInfo], int, int] | None = None
-            while time.time() < deadline:
-                try:
-                    data, (src_ip, _) = sock.recvfrom(8192)
-                except socket.timeout:
-                    break
+            for data, src_ip in receive_datagrams(sock, time.monotonic() + timeout, 8192):
                 if src_ip != ip:
                     continue
                 parsed = parse_devices_response(data, src_ip)
@@ -383,54 +442,61 @@ def query_devices(ip: str, port: int, timeout: float, max_pages: int) -> list[De
                 break
             read_index = current_index + qty
     finally:
-        sock.close()
+        if own_sock:
+            sock.close()
 
     return all_devices
 
 
-def query_processor_discovery_info(ip: str, port: int, timeout: float, probes: int) -> ProcessorInfo | None:
+def query_processor_discovery_info(
+    ip: str,
+    port: int,
+    timeout: float,
+    probes: int,
+    sock: socket.socket | None = None,
+) -> ProcessorInfo | None:
     packet = build_discover_packet()
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    own_sock = sock is None
+    if own_sock:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
-        sock.settimeout(max(0.05, timeout))
         for _ in range(max(1, probes)):
             sock.sendto(packet, (ip, port))
-            deadline = time.time() + timeout
-            while time.time() < deadline:
-                try:
-                    data, (src_ip, _) = sock.recvfrom(4096)
-                except socket.timeout:
-                    break
+            for data, src_ip in receive_datagrams(sock, time.monotonic() + timeout):
                 if src_ip != ip:
                     continue
                 parsed = parse_processor_response(data, src_ip)
                 if parsed is not None:
                     return parsed
     finally:
-        sock.close()
+        if own_sock:
+            sock.close()
     return None
 
 
-def query_processor_bios_info(ip: str, port: int, timeout: float, probes: int) -> BiosInfo | None:
+def query_processor_bios_info(
+    ip: str,
+    port: int,
+    timeout: float,
+    probes: int,
+    sock: socket.socket | None = None,
+) -> BiosInfo | None:
     packet = build_get_bios_packet()
-    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    own_sock = sock is None
+    if own_sock:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
-        sock.settimeout(max(0.05, timeout))
         for _ in range(max(1, probes)):
             sock.sendto(packet, (ip, port))
-            deadline = time.time() + timeout
-            while time.time() < deadline:
-                try:
-                    data, (src_ip, _) = sock.recvfrom(4096)
-                except socket.timeout:
-                    break
+            for data, src_ip in receive_datagrams(sock, time.monotonic() + timeout):
                 if src_ip != ip:
                     continue
                 parsed = parse_bios_response(data)
                 if parsed is not None:
                     return parsed
     finally:
-        sock.close()
+        if own_sock:
+            sock.close()
     return None
 
 
@@ -444,16 +510,21 @@ def identify_module(
     timeout: float,
 ) -> int:
     packet = build_identify_packet(serial=serial, beep=beep)
+    interval = max(0.01, interval)  # never flood the processor
     sends = 0
-    end_time = time.time() + max(0.0, duration)
+    start = time.monotonic()
+    end_time = start + max(0.0, duration)
 
     sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
         sock.settimeout(max(0.05, timeout))
-        while time.time() < end_time:
+        next_send = start
+        while next_send < end_time:
             sock.sendto(packet, (ip, port))
             sends += 1
-            time.sleep(max(0.01, interval))
+            # Fixed-rate schedule: time spent in sendto does not push later sends back
+            next_send = start + sends * interval
+            time.sleep(max(0.0, next_send - time.monotonic()))
     finally:
         sock.close()
     return sends
@@ -484,13 +555,33 @@ def print_devices(devices: list[DeviceInfo]) -> None:
         )
 
 
+@lru_cache(maxsize=None)
+def _orjson():
+    """Optional faster JSON encoder, imported on first use to keep CLI startup light."""
+    try:
+        import orjson
+    except ImportError:
+        return None
+    return orjson
+
+
+def write_json(data: Any, fp) -> None:
+    orjson = _orjson()
+    if orjson is not None:
+        fp.write(orjson.dumps(data, option=orjson.OPT_INDENT_2).decode("utf-8"))
+    else:
+        # Write each chunk the encoder yields as soon as it is produced
+        json.dump(data, fp, indent=2)
+    fp.write("\n")
+
+
 def emit_json(data: Any, out_path: str | None) -> None:
-    text = json.dumps(data, indent=2)
     if out_path:
-        Path(out_path).write_text(text + "\n", encoding="utf-8")
+        with Path(out_path).open("w", encoding="utf-8") as fp:
+            write_json(data, fp)
         print(f"Wrote {out_path}")
     else:
-        print(text)
+        write_json(data, sys.stdout)
 
 
 def cmd_discover(args: argparse.Namespace) -> int:
@@ -529,10 +620,21 @@ def cmd_scan_all(args: argparse.Namespace) -> int:
         subnet=args.subnet,
         sweep_limit=args.sweep_limit,
     )
+    device_lists: list[list[DeviceInfo]] = []
+    if processors:
+        from concurrent.futures import ThreadPoolExecutor  # only scan-all needs threads
+
+        # Each processor pages over its own socket, so their UDP waits can overlap
+        with ThreadPoolExecutor(max_workers=min(16, len(processors))) as executor:
+            device_lists = list(
+                executor.map(
+                    lambda p: query_devices(p.ip or p.source_ip, args.port, args.device_timeout, args.max_pages),
+                    processors,
+                )
+            )
+
     results: list[dict[str, Any]] = []
-    for p in processors:
-        ip = p.ip or p.source_ip
-        devices = query_devices(ip, args.port, args.device_timeout, args.max_pages)
+    for p, devices in zip(processors, device_lists):
         if devices or args.include_empty:
             results.append(
                 {
@@ -576,16 +678,27 @@ def cmd_identify(args: argparse.Namespace) -> int:
 
 
 def cmd_processor_info(args: argparse.Namespace) -> int:
-    proc = query_processor_discovery_info(args.ip, args.port, args.timeout, args.probes)
-    bios = query_processor_bios_info(args.ip, args.port, args.timeout, args.probes)
+    # One socket (and local port) for every query against this processor
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    try:
+        proc = query_processor_discovery_info(args.ip, args.port, args.timeout, args.probes, sock=sock)
+        bios = query_processor_bios_info(args.ip, args.port, args.timeout, args.probes, sock=sock)
+        devices = (
+            query_devices(args.ip, args.port, args.timeout, args.max_pages, sock=sock)
+            if args.with_devices
+            else None
+        )
+    finally:
+        sock.close()
+
     payload: dict[str, Any] = {
         "target_ip": args.ip,
         "port": args.port,
         "processor": asdict(proc) if proc else None,
         "bios": asdict(bios) if bios else None,
     }
-    if args.with_devices:
-        payload["devices"] = [asdict(d) for d in query_devices(args.ip, args.port, args.timeout, args.max_pages)]
+    if devices is not None:
+        payload["devices"] = [asdict(d) for d in devices]
 
     if args.json:
         emit_json(payload, args.out)
@@ -612,10 +725,7 @@ def cmd_processor_info(args: argparse.Namespace) -> int:
     return 0
 
 
-def build_parser() -> argparse.ArgumentParser:
-    p = argparse.ArgumentParser(description="Roehn Wizard UDP discovery utility")
-    sub = p.add_subparsers(dest="command", required=True)
-
+def _add_discover_parser(sub: argparse._SubParsersAction) -> None:
     p_discover = sub.add_parser("discover", help="Broadcast discover processors")
     p_discover.add_argument("--port", type=int, default=2006, help="UDP port (default: 2006)")
     p_discover.add_argument("--broadcast-ip", default="255.255.255.255", help="Broadcast address")
@@ -642,6 +752,8 @@ def build_parser() -> argparse.ArgumentParser:
     p_discover.add_argument("--out", default=None, help="Write JSON output to file (with --json)")
     p_discover.set_defaults(func=cmd_discover)
 
+
+def _add_devices_parser(sub: argparse._SubParsersAction) -> None:
     p_devices = sub.add_parser("devices", help="Enumerate connected devices on one processor IP")
     p_devices.add_argument("ip", help="Processor IP address")
     p_devices.add_argument("--port", type=int, default=2006, help="UDP port (default: 2006)")
@@ -651,6 +763,8 @@ def build_parser() -> argparse.ArgumentParser:
     p_devices.add_argument("--out", default=None, help="Write JSON output to file (with --json)")
     p_devices.set_defaults(func=cmd_devices)
 
+
+def _add_scan_all_parser(sub: argparse._SubParsersAction) -> None:
     p_scan = sub.add_parser("scan-all", help="Discover processors, then enumerate devices on each")
     p_scan.add_argument("--port", type=int, default=2006, help="UDP port (default: 2006)")
     p_scan.add_argument("--broadcast-ip", default="255.255.255.255", help="Broadcast address")
@@ -685,6 +799,8 @@ def build_parser() -> argparse.ArgumentParser:
     p_scan.add_argument("--out", default=None, help="Write JSON output to file (with --json)")
     p_scan.set_defaults(func=cmd_scan_all)
 
+
+def _add_identify_parser(sub: argparse._SubParsersAction) -> None:
     p_ident = sub.add_parser(
         "identify",
         help="Blink/beep identify a module by serial on a processor IP",
@@ -698,6 +814,8 @@ def build_parser() -> argparse.ArgumentParser:
     p_ident.add_argument("--no-beep", action="store_true", help="Disable beep flag in identify payload")
     p_ident.set_defaults(func=cmd_identify)
 
+
+def _add_processor_info_parser(sub: argparse._SubParsersAction) -> None:
     p_info = sub.add_parser("processor-info", help="Query processor discovery and BIOS/capacity info")
     p_info.add_argument("ip", help="Processor IP address")
     p_info.add_argument("--port", type=int, default=2006, help="UDP port (default: 2006)")
@@ -709,11 +827,31 @@ def build_parser() -> argparse.ArgumentParser:
     p_info.add_argument("--out", default=None, help="Write JSON output to file (with --json)")
     p_info.set_defaults(func=cmd_processor_info)
 
+
+_SUBCOMMANDS = {
+    "discover": _add_discover_parser,
+    "devices": _add_devices_parser,
+    "scan-all": _add_scan_all_parser,
+    "identify": _add_identify_parser,
+    "processor-info": _add_processor_info_parser,
+}
+
+
+def build_parser(command: str | None = None) -> argparse.ArgumentParser:
+    """Build the CLI parser; with a known `command`, only that subcommand's options are set up."""
+    p = argparse.ArgumentParser(description="Roehn Wizard UDP discovery utility")
+    sub = p.add_subparsers(dest="command", required=True)
+    if command in _SUBCOMMANDS:
+        _SUBCOMMANDS[command](sub)
+    else:
+        # --help, typos or no command: register everything so usage/errors list all choices
+        for add_parser in _SUBCOMMANDS.values():
+            add_parser(sub)
     return p
 
 
 def main() -> int:
-    parser = build_parser()
+    parser = build_parser(sys.argv[1] if len(sys.argv) > 1 else None)
     args = parser.parse_args()
     return int(args.func(args))
 